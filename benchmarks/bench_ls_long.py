@@ -0,0 +1,128 @@
+"""
+Benchmark of 'ls -l': stat syscalls and owner/group lookups per entry.
+
+Compares the old pathlib listing (os.stat + 2x Path.stat + Path.owner + Path.group per entry)
+with ConsoleService.ls(long=True), which reuses the cached stat of os.scandir entries.
+
+Run from the repository root:
+    python -m benchmarks.bench_ls_long --entries 20000
+"""
+import argparse
+import grp
+import logging
+import os
+import pwd
+import stat
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from unittest import mock
+
+from src.common import owners
+from src.services.console_service import ConsoleService
+
+
+class Counters:
+    def __init__(self):
+        self.stat = 0
+        self.lookups = 0
+
+
+def legacy_ls_long(path: Path) -> list[str]:
+    """
+    'ls -l' as it was implemented before the scandir rewrite
+    """
+    return [f"{stat.filemode(os.stat(entry.absolute()).st_mode)}\t{entry.owner()}\t{entry.group()}\t{entry.stat().st_size}\t{time.ctime(entry.stat().st_atime)}\t{entry.name}" + "\n" for entry in path.iterdir()]
+
+
+class _CountingEntry:
+    """
+    os.DirEntry proxy: DirEntry.stat is implemented in C and can't be patched
+    """
+    def __init__(self, entry: os.DirEntry, counters: Counters):
+        self._entry = entry
+        self._counters = counters
+        self._stat_done = False
+        self.name = entry.name
+        self.path = entry.path
+
+    def stat(self, *, follow_symlinks: bool = True):
+        # DirEntry caches its stat result, only the first call is a syscall
+        if not self._stat_done:
+            self._counters.stat += 1
+            self._stat_done = True
+        return self._entry.stat(follow_symlinks=follow_symlinks)
+
+
+class _CountingScandir:
+    def __init__(self, real_scandir, path, counters: Counters):
+        self._it = real_scandir(path)
+        self._counters = counters
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self._it.close()
+
+    def __iter__(self):
+        return (_CountingEntry(entry, self._counters) for entry in self._it)
+
+
+@contextmanager
+def count_syscalls(counters: Counters):
+    real_stat, real_scandir = os.stat, os.scandir
+    real_getpwuid, real_getgrgid = pwd.getpwuid, grp.getgrgid
+
+    def counting_stat(*args, **kwargs):
+        counters.stat += 1
+        return real_stat(*args, **kwargs)
+
+    def counting_getpwuid(uid):
+        counters.lookups += 1
+        return real_getpwuid(uid)
+
+    def counting_getgrgid(gid):
+        counters.lookups += 1
+        return real_getgrgid(gid)
+
+    with mock.patch("os.stat", counting_stat), \
+            mock.patch("os.scandir", lambda path: _CountingScandir(real_scandir, path, counters)), \
+            mock.patch("pwd.getpwuid", counting_getpwuid), \
+            mock.patch("grp.getgrgid", counting_getgrgid):
+        yield
+
+
+def run(entries: int) -> None:
+    logger = logging.getLogger("bench")
+    logger.addHandler(logging.NullHandler())
+    logger.propagate = False
+    service = ConsoleService(logger)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(entries):
+            Path(tmp, f"file_{i:07}.log").write_bytes(b"x" * (i % 512))
+
+        for name, listing in (
+            ("legacy pathlib", lambda: legacy_ls_long(Path(tmp))),
+            ("scandir + cache", lambda: service.ls(tmp, long=True)),
+        ):
+            owners.user_name.cache_clear()
+            owners.group_name.cache_clear()
+            counters = Counters()
+            start = time.perf_counter()
+            with count_syscalls(counters):
+                lines = listing()
+            elapsed = time.perf_counter() - start
+            print(
+                f"{name:16} {len(lines)} entries  {elapsed:8.3f} s  "
+                f"stat/entry: {counters.stat / entries:5.2f}  "
+                f"passwd+group lookups/entry: {counters.lookups / entries:5.3f}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--entries", type=int, default=20000, help="Number of files in the listed directory")
+    run(parser.parse_args().entries)
@@ -0,0 +1,58 @@
+"""
+Benchmark of shell mode: per-command latency when every command re-runs the app callback
+(logging dictConfig, ConsoleService with curpath.txt round-trip, Container) versus a persistent session.
+
+Run from the repository root:
+    python -m benchmarks.bench_shell --commands 500
+"""
+import argparse
+import io
+import logging
+import statistics
+import tempfile
+import time
+from contextlib import redirect_stdout
+from pathlib import Path
+
+from src import main
+from src.dependencies.container import Container
+from src.services.console_service import ConsoleService
+
+
+def report(name: str, latencies: list[float]) -> None:
+    latencies = sorted(latencies)
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+    print(f"{name:22} p50: {statistics.median(latencies) * 1000:7.3f} ms   p99: {p99 * 1000:7.3f} ms")
+
+
+def run(commands: int) -> None:
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(20):
+            Path(tmp, f"file_{i}.txt").write_text("x")
+        argv: list[str] = ["ls", tmp]
+
+        # Old behaviour: nothing is passed in, the callback sets everything up for every command
+        rebuild: list[float] = []
+        with redirect_stdout(io.StringIO()):
+            for _ in range(commands):
+                main._logging_configured = False
+                start = time.perf_counter()
+                main.app(argv, standalone_mode=False)
+                rebuild.append(time.perf_counter() - start)
+
+        container = Container(console_service=ConsoleService(logger=logging.getLogger("src.main"), set_path_function=main.set_path))
+        session: list[float] = []
+        with redirect_stdout(io.StringIO()):
+            for _ in range(commands):
+                start = time.perf_counter()
+                main.app(argv, standalone_mode=False, obj=container)
+                session.append(time.perf_counter() - start)
+
+    report("rebuild per command", rebuild)
+    report("persistent session", session)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--commands", type=int, default=500, help="Number of commands to run in each mode")
+    run(parser.parse_args().commands)
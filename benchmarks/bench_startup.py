@@ -0,0 +1,114 @@
+"""
+Cold-start budget of the CLI: import time of src.main (python -X importtime) and wall-clock time
+from process start to the first byte of output for `ls`, `cat` and `--help`.
+Medians are compared with benchmarks/startup_budget.json, the script exits with 1 when any of them
+is slower than the budget by more than the tolerance.
+
+Run from the repository root:
+    python -m benchmarks.bench_startup --runs 15
+    python -m benchmarks.bench_startup --update      # record current numbers as the new budget
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT: Path = Path(__file__).resolve().parents[1]
+BUDGET_FILE: Path = Path(__file__).with_name("startup_budget.json")
+
+
+def import_time(runs: int) -> tuple[float, list[tuple[int, str]]]:
+    """
+    :return: median cumulative import time of src.main in ms and the slowest modules of the last run (self time, us)
+    """
+    totals: list[float] = []
+    modules: list[tuple[int, str]] = []
+    for _ in range(runs):
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", "import src.main"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        )
+        modules = []
+        for line in result.stderr.splitlines():
+            # import time: self [us] | cumulative | imported package
+            if not line.startswith("import time:") or "|" not in line:
+                continue
+            self_us, cumulative_us, name = (column.strip() for column in line[len("import time:"):].split("|"))
+            if not self_us.isdigit():
+                continue    # header line
+            modules.append((int(self_us), name))
+            if name == "src.main":
+                totals.append(int(cumulative_us) / 1000)
+    return statistics.median(totals), sorted(modules, reverse=True)[:10]
+
+
+def first_output(argv: list[str], runs: int) -> float:
+    """
+    :return: median time in ms from starting `python -m src.main argv` to its first byte on stdout
+    """
+    samples: list[float] = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        process = subprocess.Popen(
+            [sys.executable, "-m", "src.main", *argv],
+            cwd=ROOT, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL,
+        )
+        first: bytes = os.read(process.stdout.fileno(), 1)
+        samples.append(time.perf_counter() - start)
+        process.stdout.read()
+        process.stdout.close()
+        if process.wait() != 0 or not first:
+            raise RuntimeError(f"'{' '.join(argv)}' failed or printed nothing")
+    return statistics.median(samples) * 1000
+
+
+def measure(runs: int) -> dict[str, float]:
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(20):
+            Path(tmp, f"file_{i}.txt").write_text("x" * 100)
+        import_ms, slowest = import_time(runs)
+        results: dict[str, float] = {
+            "import src.main": import_ms,
+            "--help": first_output(["--help"], runs),
+            "ls": first_output(["ls", tmp], runs),
+            "cat": first_output(["cat", str(Path(tmp, "file_0.txt"))], runs),
+        }
+    print("Slowest modules (self time):")
+    for self_us, name in slowest:
+        print(f"  {self_us / 1000:7.2f} ms  {name.strip()}")
+    return results
+
+
+def check(results: dict[str, float], budget: dict[str, float], tolerance: float) -> bool:
+    ok: bool = True
+    print(f"{'':16} {'median':>10} {'budget':>10}")
+    for name, value in results.items():
+        limit: float | None = budget.get(name)
+        verdict: str = ""
+        if limit is not None and value > limit * (1 + tolerance):
+            verdict = "REGRESSION"
+            ok = False
+        budget_column: str = f"{limit:7.1f} ms" if limit is not None else "         -"
+        print(f"{name:16} {value:7.1f} ms {budget_column}  {verdict}")
+    return ok
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=15, help="Process starts per measurement, the median is taken")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed slowdown over the budget, 0.25 = 25%%")
+    parser.add_argument("--update", action="store_true", help="Write measured medians to the budget file")
+    args = parser.parse_args()
+
+    measured: dict[str, float] = measure(args.runs)
+    if args.update:
+        BUDGET_FILE.write_text(json.dumps({k: round(v, 1) for k, v in measured.items()}, indent=4) + "\n")
+        print(f"Budget written to {BUDGET_FILE}")
+        sys.exit(0)
+    budget_data: dict[str, float] = json.loads(BUDGET_FILE.read_text()) if BUDGET_FILE.exists() else {}
+    sys.exit(0 if check(measured, budget_data, args.tolerance) else 1)
@@ -0,0 +1,60 @@
+"""
+Thin client for the `serve` daemon: python -m src.client [команда] [аргументы/параметры]
+Forwards argv over the daemon's Unix socket and prints what the command writes.
+Without a running daemon the command is executed in this process, as `python -m src.main` would.
+Only the standard library is imported until the fallback is needed.
+"""
+import json
+import socket
+import sys
+
+from src.common import protocol
+
+
+def run_remote(argv: list[str], sock: socket.socket) -> int:
+    """
+    :return: exit code of the command executed by the daemon
+    """
+    protocol.send_frame(sock, protocol.ARGV, json.dumps(argv).encode("utf-8"))
+    while True:
+        kind, payload = protocol.recv_frame(sock)
+        if kind == protocol.STDOUT:
+            sys.stdout.buffer.write(payload)
+            sys.stdout.buffer.flush()
+        elif kind == protocol.STDERR:
+            sys.stderr.buffer.write(payload)
+            sys.stderr.buffer.flush()
+        elif kind == protocol.PROMPT:
+            protocol.send_frame(sock, protocol.INPUT, sys.stdin.readline().encode("utf-8"))
+        elif kind == protocol.EXIT:
+            return int(payload)
+
+
+def run_in_process(argv: list[str]) -> int:
+    from src.main import app
+
+    try:
+        app(argv, prog_name="console")
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+    return 0
+
+
+def main(argv: list[str]) -> int:
+    if not hasattr(socket, "AF_UNIX"):
+        return run_in_process(argv)
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(protocol.socket_path())
+    except OSError:
+        sock.close()
+        return run_in_process(argv)
+    with sock:
+        try:
+            return run_remote(argv, sock)
+        except BrokenPipeError:     # output closed early, e.g. piped into head
+            return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
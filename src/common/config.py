@@ -1,5 +1,5 @@
 # ruff: noqa
-import logging.config
+# Plain data: logging.config itself is imported only when the config is applied
 
 
 LOGGING_CONFIG = {
@@ -9,7 +9,11 @@ LOGGING_CONFIG = {
         "standard": {
             "format": "[%(asctime)s] %(levelname)s: %(message)s",
             "datefmt": "%Y-%m-%d %H:%M:%S",
-        }
+        },
+        "json": {
+            # CONSOLE_LOG_FORMAT=json, see src/common/logging_setup.py
+            "()": "src.common.logging_setup.JsonLinesFormatter",
+        },
     },
     "handlers": {
         # "console": {
@@ -0,0 +1,137 @@
+"""
+Logging setup: LOGGING_CONFIG as is (synchronous file writes), or the same handlers behind a bounded queue
+drained by a background thread, so a command never waits for the disk or for log rotation.
+
+Environment variables:
+    CONSOLE_LOG_MODE        sync (default) | queue
+    CONSOLE_LOG_QUEUE_SIZE  records waiting in the queue, 10000 by default
+    CONSOLE_LOG_POLICY      drop (default) - full queue drops new records and counts them,
+                            block - the command waits until the writer catches up
+    CONSOLE_LOG_FORMAT      text (default) | json - one JSON object per line
+"""
+import atexit
+import copy
+import json
+import logging
+import logging.config
+import logging.handlers
+import os
+import queue
+from datetime import datetime, timezone
+
+from src.common.config import LOGGING_CONFIG
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """
+    One JSON object per record: time, level, logger, message and exception traceback if any
+    """
+    def format(self, record: logging.LogRecord) -> str:
+        data: dict[str, str] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False)
+
+
+class BoundedQueueHandler(logging.handlers.QueueHandler):
+    def __init__(self, log_queue: queue.Queue, block: bool = False):
+        """
+        :param log_queue: bounded queue read by the listener thread
+        :param block: full queue - wait for free space (True) or drop the record (False)
+        """
+        super().__init__(log_queue)
+        self._block: bool = block
+        self.dropped: int = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Only what can't be done later is done here: the message is rendered (args may change),
+        # the traceback is turned into text. Formatting itself happens on the listener thread.
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self._block:
+            self.queue.put(record)
+            return
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+def configure_logging() -> None:
+    """
+    Apply LOGGING_CONFIG with the formatter and mode chosen by environment variables
+    """
+    config: dict = copy.deepcopy(LOGGING_CONFIG)
+    if os.environ.get("CONSOLE_LOG_FORMAT") == "json":
+        for handler in config["handlers"].values():
+            handler["formatter"] = "json"
+    logging.config.dictConfig(config)
+
+    if os.environ.get("CONSOLE_LOG_MODE") == "queue":
+        start_queue(
+            int(os.environ.get("CONSOLE_LOG_QUEUE_SIZE", "10000")),
+            block=os.environ.get("CONSOLE_LOG_POLICY") == "block",
+        )
+
+
+def start_queue(maxsize: int, block: bool = False) -> BoundedQueueHandler:
+    """
+    Move root logger handlers behind a bounded queue served by a background thread
+    :param maxsize: queue capacity in records
+    :param block: backpressure instead of dropping when the queue is full
+    :return: handler now attached to the root logger
+    """
+    global _listener
+    stop_queue()
+    root = logging.getLogger()
+    handlers: list[logging.Handler] = root.handlers[:]
+    for handler in handlers:
+        root.removeHandler(handler)
+
+    queue_handler = BoundedQueueHandler(queue.Queue(maxsize), block)
+    root.addHandler(queue_handler)
+    _listener = logging.handlers.QueueListener(queue_handler.queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(stop_queue)     # the rest of the queue is written before the process exits
+    return queue_handler
+
+
+def stop_queue() -> None:
+    """
+    Write everything still queued, report dropped records, put the handlers back on the root logger
+    """
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        if isinstance(handler, BoundedQueueHandler):
+            root.removeHandler(handler)
+            if handler.dropped:
+                record = logging.LogRecord(
+                    "src.common.logging_setup", logging.WARNING, __file__, 0,
+                    f"Log queue was full, {handler.dropped} records dropped", None, None,
+                )
+                for target in listener.handlers:
+                    target.handle(record)
+    for handler in listener.handlers:
+        root.addHandler(handler)
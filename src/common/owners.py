@@ -0,0 +1,40 @@
+from functools import lru_cache
+
+try:
+    import grp
+    import pwd
+except ImportError:  # Windows - there are no passwd/group databases
+    grp = None  # type: ignore[assignment]
+    pwd = None  # type: ignore[assignment]
+
+
+# Process-wide caches: uid/gid -> name lookups hit /etc/passwd, /etc/group (or NSS/LDAP)
+# on every call, and a directory usually has only a handful of distinct owners.
+@lru_cache(maxsize=None)
+def user_name(uid: int) -> str:
+    """
+    Resolve uid to user name, fall back to the numeric id if it has no passwd entry
+    :param uid: numeric user id (st_uid)
+    :return: user name
+    """
+    if pwd is None:
+        return str(uid)
+    try:
+        return pwd.getpwuid(uid).pw_name
+    except KeyError:
+        return str(uid)
+
+
+@lru_cache(maxsize=None)
+def group_name(gid: int) -> str:
+    """
+    Resolve gid to group name, fall back to the numeric id if it has no group entry
+    :param gid: numeric group id (st_gid)
+    :return: group name
+    """
+    if grp is None:
+        return str(gid)
+    try:
+        return grp.getgrgid(gid).gr_name
+    except KeyError:
+        return str(gid)
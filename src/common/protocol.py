@@ -0,0 +1,54 @@
+"""
+Wire protocol between `python -m src.client` and the `serve` daemon.
+Every message is a frame: 1 byte type, 4 bytes big-endian payload length, payload.
+Kept free of heavy imports - the client loads it on every call.
+"""
+import os
+import socket
+import struct
+import tempfile
+
+# client -> daemon
+ARGV = b"a"     # JSON list of command line arguments
+INPUT = b"i"    # line typed by the user in answer to PROMPT
+# daemon -> client
+STDOUT = b"o"
+STDERR = b"e"
+PROMPT = b"p"   # command waits for a line of input (rm confirmation)
+EXIT = b"x"     # exit code as ASCII, last frame of a command
+
+_HEADER = struct.Struct(">cI")
+
+
+def socket_path() -> str:
+    """
+    Daemon socket: $CONSOLE_SOCKET, or a per-user socket in XDG_RUNTIME_DIR / temp directory
+    """
+    if custom := os.environ.get("CONSOLE_SOCKET"):
+        return custom
+    runtime_dir: str = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else os.getlogin()
+    return os.path.join(runtime_dir, f"console-app-{uid}.sock")
+
+
+def send_frame(sock: socket.socket, kind: bytes, payload: bytes = b"") -> None:
+    sock.sendall(_HEADER.pack(kind, len(payload)) + payload)
+
+
+def recv_frame(sock: socket.socket) -> tuple[bytes, bytes]:
+    """
+    :return: frame type and payload
+    :raise ConnectionError: peer closed the connection
+    """
+    kind, length = _HEADER.unpack(_recv_exact(sock, _HEADER.size))
+    return kind, _recv_exact(sock, length)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    data = bytearray()
+    while len(data) < size:
+        chunk: bytes = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("Connection closed")
+        data += chunk
+    return bytes(data)
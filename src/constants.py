@@ -0,0 +1,17 @@
+import os
+
+# Size of one read/write block for streaming file commands (cat, copy, hashing)
+CHUNK_SIZE: int = 1024 * 1024
+
+# Default number of worker threads for parallel file commands, same formula as ThreadPoolExecutor
+DEFAULT_JOBS: int = min(32, (os.cpu_count() or 1) + 4)
+
+# Manifest of cp --update --manifest, stored at destination root
+CP_MANIFEST_NAME: str = ".cp-manifest.json"
+
+# Directory for rm --trash, created on the same file system as the removed path
+TRASH_DIR_NAME: str = ".console_trash"
+
+# ConsoleService.handle_path cache: number of paths and seconds an answer is trusted
+STAT_CACHE_SIZE = 1024
+STAT_CACHE_TTL = 2.0
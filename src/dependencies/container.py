@@ -1,9 +1,10 @@
 from dataclasses import dataclass
-from logging import Logger
+from typing import TYPE_CHECKING
 
-from src.services.console_service import ConsoleService
+if TYPE_CHECKING:
+    from src.services.console_service import ConsoleService
 
 
 @dataclass
 class Container:
-    console_service: ConsoleService
+    console_service: "ConsoleService"
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class MoveStrategy(str, Enum):
+    rename = ("rename",)             # same file system - one rename syscall
+    copy_delete = ("copy_delete",)   # across file systems - copy, verify, delete source
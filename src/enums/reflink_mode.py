@@ -0,0 +1,7 @@
+from enum import Enum
+
+
+class ReflinkMode(str, Enum):
+    auto = ("auto",)
+    always = ("always",)
+    never = ("never",)
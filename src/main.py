@@ -1,22 +1,29 @@
-from src.common.config import LOGGING_CONFIG
-
-import logging
 import sys
 from pathlib import Path
 
 import typer # type: ignore
 from typer import Typer, Context
 
+from src.constants import DEFAULT_JOBS
 from src.dependencies.container import Container
 from src.enums.file_mode import FileReadMode
-from src.services.console_service import ConsoleService
+from src.enums.move_strategy import MoveStrategy
+from src.enums.reflink_mode import ReflinkMode
+
+from typing import TYPE_CHECKING, Annotated
 
-from typing import Annotated
+# Logging setup, the service and daemon/socket code are imported where they are needed:
+# `--help` loads none of them, every command loads only its own engine (see benchmarks/bench_startup.py)
+if TYPE_CHECKING:
+    import logging
+
+    from src.services.copy_engine import CopyReport
 
 app = Typer()
 
 _current_path: Path
 _shell_mode: bool = False
+_logging_configured: bool = False
 
 def set_path(new_path: Path):
     """
@@ -35,9 +42,19 @@ def get_container(ctx: Context) -> Container:
 
 @app.callback()
 def main(ctx: Context):
-    global _shell_mode
+    global _shell_mode, _logging_configured
+
+    if isinstance(ctx.obj, Container):
+        return      # command of a shell session - the session's service is reused as is
 
-    logging.config.dictConfig(LOGGING_CONFIG)
+    import logging
+
+    from src.common.logging_setup import configure_logging
+    from src.services.console_service import ConsoleService
+
+    if not _logging_configured:
+        configure_logging()
+        _logging_configured = True
     logger = logging.getLogger(__name__)
     command = " ".join(sys.argv[1:])
     if not _shell_mode:
@@ -61,6 +78,14 @@ def shell(ctx: Context):
     _shell_mode = True
 
     logger = container.console_service._logger
+    try:
+        _run_shell(container, logger)
+    finally:
+        # Working directory lives in memory during the session, file is only touched on cd and here
+        container.console_service.save_current_path()
+
+
+def _run_shell(container: Container, logger: "logging.Logger") -> None:
     while True:
         try:
             command_input: str = input(f"{str(_current_path)} ")
@@ -83,17 +108,40 @@ def shell(ctx: Context):
 
             logger.info(command_input)
             try:
-                app(command_params, standalone_mode=False)
+                app(command_params, standalone_mode=False, obj=container)
             except Exception as e:
                 typer.echo(e)
                 logger.error(e)
             
         except OSError as e:
             typer.echo(e)
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, EOFError):
             break
 
 
+@app.command(help="Run daemon for src.client: keeps a warm service behind a Unix socket")
+def serve(
+    ctx: Context,
+    socket_path: Annotated[str | None, typer.Option("--socket", help="Unix socket path")] = None
+):
+    """
+    Serve commands sent by `python -m src.client` until interrupted
+    :param ctx: typer context object for imitating di container
+    :param socket_path: socket to listen on, $CONSOLE_SOCKET or per-user socket by default
+    :return:
+    """
+    from src import server
+    from src.common import protocol
+
+    container: Container = get_container(ctx)
+    path: str = socket_path or protocol.socket_path()
+    typer.echo(f"Serving on {path}. Stop: Ctrl+C")
+    try:
+        server.serve(app, container, container.console_service._logger, path)
+    except OSError as e:
+        typer.echo(e)
+
+
 @app.command(help="List all files in a directory")
 def ls(
     ctx: Context,
@@ -135,18 +183,33 @@ def cat(
     try:
         container: Container = get_container(ctx)
         mode_param = FileReadMode.bytes if mode else FileReadMode.string
-        data = container.console_service.cat(
-            filename,
-            mode=mode_param,
-        )
-        if isinstance(data, bytes):
-            sys.stdout.buffer.write(data)
-        else:
-            sys.stdout.write(data)
+        if mode_param == FileReadMode.bytes:
+            # Zero-copy: the kernel moves file pages to stdout, nothing is read into Python
+            out_fd = _stdout_fd()
+            if out_fd is not None and container.console_service.cat_to_fd(filename, out_fd):
+                return
+        for chunk in container.console_service.cat_stream(filename, mode=mode_param):
+            if isinstance(chunk, bytes):
+                sys.stdout.buffer.write(chunk)
+            else:
+                sys.stdout.write(chunk)
     except OSError as e:
         typer.echo(e)
 
 
+def _stdout_fd() -> int | None:
+    """
+    Flush buffered stdout and return its descriptor, None if stdout is not a real file (tests, captured output)
+    """
+    import io
+
+    try:
+        sys.stdout.flush()
+        return sys.stdout.fileno()
+    except (AttributeError, io.UnsupportedOperation, ValueError):
+        return None
+
+
 @app.command(help="Change directory")
 def cd(
     ctx: Context,
@@ -169,7 +232,12 @@ def cp(
     ctx: Context,
     filename: Annotated[str, typer.Argument(help="File path")],
     path: Annotated[str, typer.Argument(help="Destination directory")],
-    recursive: Annotated[bool, typer.Option("--recursive", "-r", help="Recursive folder copy")] = False
+    recursive: Annotated[bool, typer.Option("--recursive", "-r", help="Recursive folder copy")] = False,
+    jobs: Annotated[int, typer.Option("--jobs", "-j", min=1, help="Number of parallel copy workers")] = DEFAULT_JOBS,
+    update: Annotated[bool, typer.Option("--update", "--sync", "-u", help="Copy only new and changed files (size + mtime)")] = False,
+    checksum: Annotated[bool, typer.Option("--checksum", "-c", help="With --update: compare contents instead of mtime")] = False,
+    manifest: Annotated[bool, typer.Option("--manifest", help="With --update -r: keep a manifest to skip unchanged files faster")] = False,
+    reflink: Annotated[ReflinkMode, typer.Option("--reflink", help="Share file extents on CoW file systems")] = ReflinkMode.auto
 ):
     """
     Copy file to destination
@@ -177,11 +245,18 @@ def cp(
     :param filename:  path of the file to be copied
     :param path:  destination path
     :param r:     option of recursive copy
+    :param jobs:  number of files copied in parallel with -r
+    :param update:   skip files which are already up to date in destination
+    :param checksum: compare file contents in update mode
+    :param manifest: use destination manifest in update mode
+    :param reflink:  auto - reflink when possible, always - fail if not possible, never - always copy data
     :return:
     """
     try:
         container: Container = get_container(ctx)
-        container.console_service.cp(filename, path, recursive)
+        report = container.console_service.cp(filename, path, recursive, jobs, update, checksum, manifest, reflink)
+        if update or checksum or manifest:
+            typer.echo(f"Copied: {report.copied}, up to date: {report.skipped}")
     except OSError as e:
         typer.echo(e)
 
@@ -190,17 +265,26 @@ def mv(
     ctx: Context,
     filename: Annotated[str, typer.Argument(help="File path")],
     path: Annotated[str, typer.Argument(help="Destination directory")],
+    jobs: Annotated[int, typer.Option("--jobs", "-j", min=1, help="Number of parallel copy workers across file systems")] = DEFAULT_JOBS
 ):
     """
     Move file to destination
     :param ctx:   typer context object for imitating di container
     :param filename:  path of the file to be moved
     :param path:  destination path
+    :param jobs:  number of files copied in parallel when moving to another file system
     :return:
     """
+    def show_progress(report: "CopyReport") -> None:
+        sys.stderr.write(f"\rMoved files: {report.copied + report.skipped}")
+
     try:
         container: Container = get_container(ctx)
-        container.console_service.mv(filename, path)
+        interactive: bool = sys.stderr.isatty()
+        strategy = container.console_service.mv(filename, path, jobs, show_progress if interactive else None)
+        if interactive and strategy == MoveStrategy.copy_delete:
+            sys.stderr.write("\n")
+        typer.echo(f"Strategy: {strategy.value}")
     except OSError as e:
         typer.echo(e)
 
@@ -208,18 +292,22 @@ def mv(
 def rm(
     ctx: Context,
     filename: Annotated[str, typer.Argument(help="File path")],
-    r: Annotated[bool, typer.Option("--recursive, -r", help="Recursive folder deletion")] = False
+    r: Annotated[bool, typer.Option("--recursive, -r", help="Recursive folder deletion")] = False,
+    trash: Annotated[bool, typer.Option("--trash", help="Move to trash instantly, delete in background")] = False,
+    jobs: Annotated[int, typer.Option("--jobs", "-j", min=1, help="Number of subtrees deleted in parallel")] = DEFAULT_JOBS
 ):
     """
     Remove file
     :param ctx:   typer context object for imitating di container
     :param filename: path of the file to be removed
     :param r: recursive remove of direction
+    :param trash: rename into trash directory on the same file system, purge later
+    :param jobs: number of sibling subtrees deleted at the same time
     :return:
     """
     try:
         container: Container = get_container(ctx)
-        container.console_service.rm(filename, r)
+        container.console_service.rm(filename, r, trash=trash, jobs=jobs)
     except OSError as e:
         typer.echo(e)
 
@@ -0,0 +1,141 @@
+"""
+Daemon mode (`serve`): a warm ConsoleService behind a Unix domain socket.
+`python -m src.client` forwards argv, gets stdout/stderr and the exit code back.
+Commands are executed one at a time - they write to the process-wide sys.stdout.
+"""
+import io
+import json
+import os
+import signal
+import socket
+import sys
+from logging import Logger
+
+import click
+from typer import Typer
+
+from src.common import protocol
+from src.dependencies.container import Container
+
+
+class _FrameWriter(io.RawIOBase):
+    """
+    Raw stream which sends everything written to it as frames of one type
+    """
+    def __init__(self, sock: socket.socket, kind: bytes):
+        self._sock = sock
+        self._kind = kind
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        protocol.send_frame(self._sock, self._kind, bytes(data))
+        return len(data)
+
+
+class _PromptReader(io.TextIOBase):
+    """
+    stdin of a forwarded command: every readline asks the client for a line typed by the user
+    """
+    def __init__(self, sock: socket.socket, stdout: io.TextIOWrapper):
+        self._sock = sock
+        self._stdout = stdout
+
+    def readable(self) -> bool:
+        return True
+
+    def readline(self, size: int = -1) -> str:
+        self._stdout.flush()  # prompt text must reach the client first
+        protocol.send_frame(self._sock, protocol.PROMPT)
+        kind, payload = protocol.recv_frame(self._sock)
+        return payload.decode("utf-8") if kind == protocol.INPUT else ""
+
+
+def _frame_stream(sock: socket.socket, kind: bytes) -> io.TextIOWrapper:
+    return io.TextIOWrapper(io.BufferedWriter(_FrameWriter(sock, kind), 64 * 1024), encoding="utf-8")
+
+
+def run_command(app: Typer, argv: list[str], container: Container, logger: Logger) -> int:
+    """
+    Run one command in the warm container
+    :return: exit code
+    """
+    try:
+        result = app(argv, prog_name="console", standalone_mode=False, obj=container)
+        return result if isinstance(result, int) else 0
+    except click.ClickException as e:
+        e.show()
+        return e.exit_code
+    except click.Abort:
+        sys.stderr.write("Aborted!\n")
+        return 1
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else 1
+    except Exception as e:
+        logger.exception(e)
+        sys.stderr.write(f"{e}\n")
+        return 1
+
+
+def handle_connection(conn: socket.socket, app: Typer, container: Container, logger: Logger) -> None:
+    """
+    Serve one client: read argv, run command with stdio redirected into the connection, send exit code
+    """
+    kind, payload = protocol.recv_frame(conn)
+    if kind != protocol.ARGV:
+        return
+    argv: list[str] = json.loads(payload)
+    logger.info(" ".join(argv))
+    # The client may have changed directory in-process while the daemon was idle
+    container.console_service.refresh_current_path()
+
+    stdout = _frame_stream(conn, protocol.STDOUT)
+    stderr = _frame_stream(conn, protocol.STDERR)
+    saved = sys.stdin, sys.stdout, sys.stderr
+    sys.stdin, sys.stdout, sys.stderr = _PromptReader(conn, stdout), stdout, stderr
+    try:
+        code: int = run_command(app, argv, container, logger)
+    finally:
+        sys.stdin, sys.stdout, sys.stderr = saved
+    stdout.flush()
+    stderr.flush()
+    protocol.send_frame(conn, protocol.EXIT, str(code).encode())
+
+
+def serve(app: Typer, container: Container, logger: Logger, path: str) -> None:
+    """
+    Accept clients until interrupted
+    :param path: Unix socket path
+    """
+    if os.path.exists(path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            try:
+                probe.connect(path)
+                raise OSError(f"Daemon is already running on {path}")
+            except ConnectionError:
+                os.unlink(path)     # left by a daemon which was killed
+
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    old_umask: int = os.umask(0o177)    # socket is accessible to its owner only
+    try:
+        server.bind(path)
+    finally:
+        os.umask(old_umask)
+    server.listen(16)
+    # kill/systemd stop - shut down the same way as Ctrl+C, removing the socket
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    logger.info(f"Serving on {path}")
+    try:
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                try:
+                    handle_connection(conn, app, container, logger)
+                except OSError as e:
+                    logger.error(f"Client connection failed: {e}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.close()
+        os.unlink(path)
@@ -1,23 +1,23 @@
 # import logging
 from logging import Logger
 import os
-import shutil
 from os import path
-import time
 from pathlib import Path    # он стал частью console_service. Мы мокаем его
-from typing import Literal
+from typing import TYPE_CHECKING, Callable, Iterator, Literal
 
+from src.constants import CHUNK_SIZE, DEFAULT_JOBS
 from src.enums.file_mode import FileReadMode
+from src.enums.move_strategy import MoveStrategy
+from src.enums.reflink_mode import ReflinkMode
+from src.services.stat_cache import StatCache, StatEntry
 
-
-import platform
-
-import stat
+# Engines (thread pools, shutil, subprocess, hashlib) are imported by the commands that use them:
+# a one-shot `ls` or `cat` shouldn't pay for loading cp/mv/rm machinery
+if TYPE_CHECKING:
+    from src.services.copy_engine import CopyReport
 
 # from zipfile import ZipFile
 
-from typing import Callable
-
 
 class ConsoleService():
     def __init__(self, logger: Logger, set_path_function: Callable[[Path], None] = None):
@@ -28,7 +28,16 @@ class ConsoleService():
         if set_path_function:
             self.set_path_main = set_path_function
 
+        # Public: hits/misses counters are read by callers
+        self.stat_cache = StatCache()
+
         self._current_path_file = Path('src/services/curpath.txt')
+        self.load_current_path()
+
+    def load_current_path(self) -> None:
+        """
+        Read current directory from curpath.txt, fall back to working directory if it's missing
+        """
         # Current directory is written to file curpath.txt
         current_path_file_data = self._current_path_file.read_text(encoding="utf-8")
         try:
@@ -41,9 +50,21 @@ class ConsoleService():
             self._current_path_file.write_text(path.abspath('.'))
         else:
             self._current_path = Path(current_path_file_data)
+        self.stat_cache.invalidate_relative()
+        self._current_path_mtime: int = self._current_path_file.stat().st_mtime_ns
         if self.set_path_main:
             self.set_path_main(self._current_path)
 
+    def refresh_current_path(self) -> None:
+        """
+        Reload current directory if curpath.txt was changed by another process (long-running daemon)
+        """
+        try:
+            if self._current_path_file.stat().st_mtime_ns != self._current_path_mtime:
+                self.load_current_path()
+        except OSError as e:
+            self._logger.error(e)
+
     def check_path_exists(self, path, path_type: str = "Folder"):
         """
         Check path existence, raise error
@@ -58,33 +79,73 @@ class ConsoleService():
     def handle_path(self, pathname: str, isDir: bool = False, checkType: bool = False) -> Path:
         path_type: str = 'Folder' if isDir else 'File'
 
-        pathname = os.path.join(self._current_path, pathname)
-        path: Path = Path(os.path.normpath(pathname))
-        self.check_path_exists(path, path_type)
+        key: str = self.stat_cache.resolve(self._current_path, pathname)
+        path: Path = Path(key)
+        entry: StatEntry | None = self.stat_cache.get(key)
+        if entry is None:
+            self.check_path_exists(path, path_type)
+            entry = self.stat_cache.put(key)
 
         msg: str = ""
         if checkType:
-            if isDir and not path.is_dir():
+            if entry.is_dir is None:
+                entry.is_dir = path.is_dir()
+            if isDir and not entry.is_dir:
                 msg = f"You entered {path} is not a directory"
                 self._logger.error(msg)
                 raise NotADirectoryError(msg)
-            elif not isDir and path.is_dir(follow_symlinks=True):
+            elif not isDir and entry.is_dir:
                 msg = f"You entered {path} is not a file"
                 self._logger.error(msg)
                 raise IsADirectoryError(msg)
         return path
 
+    def _is_dir(self, path: Path) -> bool:
+        """
+        Path.is_dir() through the stat cache, path is one returned by handle_path
+        """
+        key: str = str(path)
+        entry: StatEntry | None = self.stat_cache.get(key)
+        if entry is None:
+            entry = self.stat_cache.put(key)
+        if entry.is_dir is None:
+            entry.is_dir = path.is_dir()
+        return entry.is_dir
+
     def ls(self, pathname: str, long: bool = False) -> list[str]:
         path = self.handle_path(pathname, True, True)
         self._logger.info(f"Listing {path}")
         if long:
-
-            # permissions = stat.filemode(file_stat.st_mode)
-            if platform.system() == "Windows":
-                 return [f"{stat.filemode(os.stat(entry.absolute()).st_mode)}\t{entry.stat().st_size}\t{time.ctime(entry.stat().st_atime)}\t{entry.name}" + "\n" for entry in path.iterdir()]
-            return [f"{stat.filemode(os.stat(entry.absolute()).st_mode)}\t{entry.owner()}\t{entry.group()}\t{entry.stat().st_size}\t{time.ctime(entry.stat().st_atime)}\t{entry.name}" + "\n" for entry in path.iterdir()]
+            # One scandir pass: every entry is stat'ed exactly once, owner/group names come from cache
+            with_owner: bool = os.name != "nt"
+            with os.scandir(path) as entries:
+                return [self._format_long_entry(entry, with_owner) for entry in entries]
         return [entry.name + "\n" for entry in path.iterdir()]
 
+    @staticmethod
+    def _format_long_entry(entry: os.DirEntry, with_owner: bool = True) -> str:
+        """
+        Format one line of 'ls -l'
+        :param entry: scandir entry, its stat result is reused for all columns
+        :param with_owner: add owner and group columns (not available on Windows)
+        :return: line of detailed listing
+        """
+        import stat
+        import time
+
+        from src.common.owners import group_name, user_name
+
+        try:
+            entry_stat = entry.stat()
+        except FileNotFoundError:   # broken symlink - describe the link itself
+            entry_stat = entry.stat(follow_symlinks=False)
+
+        columns: list[str] = [stat.filemode(entry_stat.st_mode)]
+        if with_owner:
+            columns += [user_name(entry_stat.st_uid), group_name(entry_stat.st_gid)]
+        columns += [str(entry_stat.st_size), time.ctime(entry_stat.st_atime), entry.name]
+        return "\t".join(columns) + "\n"
+
     def cat(
         self,
         filename: str,
@@ -102,6 +163,59 @@ class ConsoleService():
             self._logger.exception(f"Error reading {filename}: {e}")
             raise
 
+    def cat_stream(
+        self,
+        filename: str,
+        mode: Literal[FileReadMode.string, FileReadMode.bytes] = FileReadMode.string,
+        chunk_size: int = CHUNK_SIZE,
+    ) -> Iterator[str] | Iterator[bytes]:
+        """
+        Read file chunk by chunk, memory usage doesn't depend on file size
+        :param filename: file to read
+        :param mode: string - chunks are decoded incrementally as UTF-8, bytes - raw chunks
+        :param chunk_size: size of one read in bytes
+        :return: iterator over chunks
+        """
+        path: Path = self.handle_path(filename, checkType=True)
+        self._logger.info(f"Streaming file {filename} in mode {mode}")
+        return self._read_chunks(path, mode, chunk_size)
+
+    def _read_chunks(self, path: Path, mode: FileReadMode, chunk_size: int) -> Iterator[str] | Iterator[bytes]:
+        import codecs
+
+        # Multibyte characters split between two chunks are kept in the decoder until the next chunk
+        decoder = codecs.getincrementaldecoder("utf-8")() if mode == FileReadMode.string else None
+        try:
+            with open(path, "rb") as file:
+                while chunk := file.read(chunk_size):
+                    yield decoder.decode(chunk) if decoder else chunk
+            if decoder:
+                if tail := decoder.decode(b"", final=True):
+                    yield tail
+        except (OSError, UnicodeDecodeError) as e:
+            self._logger.exception(f"Error reading {path}: {e}")
+            raise
+
+    def cat_to_fd(self, filename: str, out_fd: int) -> bool:
+        """
+        Send file bytes straight to a descriptor (stdout) with sendfile, without reading it into memory
+        :param filename: file to send
+        :param out_fd: destination file descriptor
+        :return: False if zero-copy output isn't possible here - caller should use cat_stream
+        """
+        from src.services import file_io
+
+        path: Path = self.handle_path(filename, checkType=True)
+        try:
+            with open(path, "rb") as file:
+                sent: bool = file_io.sendfile_all(file.fileno(), out_fd)
+        except OSError as e:
+            self._logger.exception(f"Error reading {filename}: {e}")
+            raise
+        if sent:
+            self._logger.info(f"Sent file {filename} with sendfile")
+        return sent
+
     def cd(
             self,
             pathname: str
@@ -116,57 +230,133 @@ class ConsoleService():
 
         self._logger.info(f"Changed directory to {path}")
         self._current_path = path
+        self.stat_cache.invalidate_relative()
         
         if self.set_path_main:
             self.set_path_main(self._current_path)
-        self._current_path_file.write_text(str(path))
+        self.save_current_path()
+
+    def save_current_path(self) -> None:
+        """
+        Persist current directory to curpath.txt for the next run
+        """
+        self._current_path_file.write_text(str(self._current_path))
+        self._current_path_mtime = self._current_path_file.stat().st_mtime_ns
 
     def cp(
             self,
             filename: str,
             pathname: str,
-            recursive: bool = False
-):
+            recursive: bool = False,
+            jobs: int = DEFAULT_JOBS,
+            update: bool = False,
+            checksum: bool = False,
+            manifest: bool = False,
+            reflink: ReflinkMode = ReflinkMode.auto,
+) -> "CopyReport":
+        """
+        Copy file or directory (recursive) to destination directory
+        :param filename: file or directory to copy
+        :param pathname: destination directory
+        :param recursive: copy directory tree
+        :param jobs: number of parallel copy workers for recursive copy
+        :param update: copy only new and changed files (size + mtime)
+        :param checksum: with update - compare file contents instead of mtime
+        :param manifest: with update and recursive - keep a manifest at destination to skip unchanged files without stat'ing them
+        :param reflink: share extents on CoW file systems: auto - when possible, always - fail otherwise, never
+        :return: number of copied and skipped files; per-file errors are raised together after the whole tree is processed
+        """
+        from functools import partial
+
+        from src.services import file_io
+        from src.services.copy_engine import CopyEngine, CopyReport
+        from src.services.sync_policy import SyncPolicy
+
         file: Path = self.handle_path(filename)
         path: Path = self.handle_path(pathname, True)
+        update = update or checksum or manifest
+        copy_function = partial(file_io.copy_file, reflink=reflink)
 
+        report = CopyReport()
+        destination: str = os.path.join(path, file.name)
         try:
             if recursive:
-                if not file.is_dir():
-                    msg = "Use 'cp' without '-r' to copy file"
-                    self._logger.error(msg)
-                    raise OSError(msg)
-                shutil.copytree(file, os.path.join(path, file.name), dirs_exist_ok=True, symlinks=True)
+                if not self._is_dir(file):
+                    raise OSError("Use 'cp' without '-r' to copy file")   # logged below
+                sync = SyncPolicy(destination, checksum, manifest) if update else None
+                report = CopyEngine(jobs, copy_function, sync).copy_tree(file, destination)
             else:
-                if file.is_dir():
-                    msg = "Use '-r' to copy directory"
-                    self._logger.error(msg)
-                    raise OSError(msg)
-                shutil.copy2(file, path)
+                if self._is_dir(file):
+                    raise OSError("Use '-r' to copy directory")   # logged below
+                if update and not SyncPolicy(path, checksum).needs_copy(str(file), destination):
+                    report.skipped = 1
+                else:
+                    copy_function(file, destination)
+                    report.copied = 1
         except Exception as e:
             self._logger.error(e)
             raise OSError(e) # Русские буквы...
+        finally:
+            self.stat_cache.invalidate_tree(destination)
 
-        self._logger.info(f"Copied {file} to {path}")
+        if report.errors:
+            for error in report.errors:
+                self._logger.error(f"Failed to copy {error}")
+            raise OSError(f"Copied {report.copied} files, {len(report.errors)} failed:\n" + "\n".join(map(str, report.errors)))
+
+        self._logger.info(f"Copied {file} to {path}: {report.copied} copied, {report.skipped} up to date")
+        return report
 
     def mv(
             self,
             filename: str,
             pathname: str,
-):
+            jobs: int = DEFAULT_JOBS,
+            progress: Callable[["CopyReport"], None] | None = None,
+) -> MoveStrategy:
+        """
+        Move file or directory into destination directory
+        :param filename: path to move
+        :param pathname: destination directory
+        :param jobs: number of parallel copy workers when moving to another file system
+        :param progress: called after every file moved to another file system
+        :return: strategy taken - rename or copy + delete
+        """
+        from src.services import file_io
+        from src.services.move_engine import MoveEngine
+
         file: Path = self.handle_path(filename)
         path: Path = self.handle_path(pathname, True)
 
-        shutil.move(file, path)
-
-        self._logger.info(f"Moved {file} to {path}")
+        try:
+            strategy, report = MoveEngine(jobs, file_io.copy_file, progress).move(file, path)
+        finally:
+            self.stat_cache.invalidate_tree(file)
+            self.stat_cache.invalidate_tree(path / file.name)
+        if report.errors:
+            for error in report.errors:
+                self._logger.error(f"Failed to move {error}")
+            raise OSError(f"Moved {report.copied + report.skipped} files, {len(report.errors)} failed (sources kept):\n" + "\n".join(map(str, report.errors)))
+
+        self._logger.info(f"Moved {file} to {path} ({strategy.value})")
+        return strategy
 
     def rm(
             self,
             filename: str,
             r: bool = False,
-            confirm: str = 'n' # для тестов
+            confirm: str = 'n', # для тестов
+            trash: bool = False,
+            jobs: int = DEFAULT_JOBS,
 ):
+        """
+        Remove file or directory
+        :param filename: path to remove
+        :param r: recursive remove of directory
+        :param confirm: 'y' - don't ask for confirmation
+        :param trash: move path to trash instantly, delete it later in background
+        :param jobs: number of subtrees deleted in parallel
+        """
         file: Path = self.handle_path(filename)
 
         if self._current_path.is_relative_to(file):
@@ -182,13 +372,24 @@ class ConsoleService():
 
 
         try:
-            if file.is_dir():
-                shutil.rmtree(file)
+            if trash:
+                from src.services.remove_engine import Trash
+
+                trash_can = Trash()
+                trashed: Path = trash_can.move(file)
+                trash_can.purge_in_background(trashed.parent)
+                self._logger.info(f"Moved {file} to trash {trashed}")
+            elif self._is_dir(file) and not file.is_symlink():
+                from src.services.remove_engine import RemoveEngine
+
+                RemoveEngine(jobs).remove_tree(file)
             else:
                 os.remove(file)
         except Exception as e:
             self._logger.error(e)
             raise OSError(e) # Русские буквы...
+        finally:
+            self.stat_cache.invalidate_tree(file)
 
         self._logger.info(f"Removed {file}")
 
@@ -0,0 +1,177 @@
+"""
+Parallel recursive copy: the source tree is walked with scandir, files are copied on a bounded thread pool.
+"""
+import os
+import shutil
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable
+
+from src.constants import DEFAULT_JOBS
+from src.services.sync_policy import SyncPolicy
+
+
+@dataclass
+class CopyError:
+    source: str
+    destination: str
+    reason: str
+
+    def __str__(self) -> str:
+        return f"{self.source} -> {self.destination}: {self.reason}"
+
+
+@dataclass
+class CopyReport:
+    copied: int = 0
+    skipped: int = 0
+    errors: list[CopyError] = field(default_factory=list)
+
+
+class CopyEngine:
+    def __init__(
+            self,
+            jobs: int = DEFAULT_JOBS,
+            copy_function: Callable[[str, str], object] | None = None,
+            sync: SyncPolicy | None = None,
+            on_done: Callable[[str, str], None] | None = None,
+            progress: Callable[[CopyReport], None] | None = None,
+    ):
+        """
+        :param jobs: number of worker threads, 1 - copy sequentially in the calling thread
+        :param copy_function: copies one file with its metadata, shutil.copy2 by default
+        :param sync: incremental mode - files the policy considers up to date are skipped
+        :param on_done: called in the worker for every file which is in place at destination (copied or up to date)
+        :param progress: called after every processed file with the report so far
+        """
+        self._jobs: int = max(1, jobs)
+        self._copy_function = copy_function or shutil.copy2
+        self._sync: SyncPolicy | None = sync
+        self._on_done = on_done
+        self._progress = progress
+        self._lock = threading.Lock()
+
+    def copy_tree(self, source: str | os.PathLike, destination: str | os.PathLike) -> CopyReport:
+        """
+        Copy directory tree, like shutil.copytree(symlinks=True, dirs_exist_ok=True).
+        Failed files don't stop the copy, they are collected in the report.
+        :param source: directory to copy
+        :param destination: directory to create (or merge into)
+        :return: number of copied files and per-file errors
+        """
+        report = CopyReport()
+        directories: list[tuple[str, str]] = []
+
+        if self._jobs == 1:
+            self._walk(os.fspath(source), os.fspath(destination), directories, report, lambda task, *args: task(*args))
+        else:
+            # Bounded queue of pending files: walking a huge tree must not outrun the workers
+            in_flight = threading.BoundedSemaphore(self._jobs * 4)
+            with ThreadPoolExecutor(max_workers=self._jobs) as pool:
+                def submit(task: Callable[..., None], *args) -> None:
+                    in_flight.acquire()
+                    pool.submit(task, *args).add_done_callback(lambda _: in_flight.release())
+
+                self._walk(os.fspath(source), os.fspath(destination), directories, report, submit)
+
+        # Directory metadata goes last - creating files inside a directory changes its mtime
+        for src_dir, dst_dir in reversed(directories):
+            try:
+                shutil.copystat(src_dir, dst_dir)
+            except OSError as e:
+                self._add_error(report, src_dir, dst_dir, e)
+        if self._sync:
+            try:
+                self._sync.save()
+            except OSError as e:
+                self._add_error(report, os.fspath(source), os.fspath(destination), e)
+        return report
+
+    def copy_one(self, source: str | os.PathLike, destination: str | os.PathLike) -> CopyReport:
+        """
+        Copy a single file or symlink through the same pipeline as copy_tree
+        :param source: file to copy
+        :param destination: destination file path
+        :return: copy report
+        """
+        report = CopyReport()
+        source, destination = os.fspath(source), os.fspath(destination)
+        if os.path.islink(source):
+            self._copy_symlink(source, destination, report)
+        else:
+            self._copy_file(source, destination, report)
+        return report
+
+    def _walk(
+            self,
+            source: str,
+            destination: str,
+            directories: list[tuple[str, str]],
+            report: CopyReport,
+            submit: Callable[..., None],
+    ) -> None:
+        stack: list[tuple[str, str]] = [(source, destination)]
+        while stack:
+            src_dir, dst_dir = stack.pop()
+            try:
+                # Directory exists before any of its files is handed to a worker
+                os.makedirs(dst_dir, exist_ok=True)
+                directories.append((src_dir, dst_dir))
+                with os.scandir(src_dir) as entries:
+                    for entry in entries:
+                        dst: str = os.path.join(dst_dir, entry.name)
+                        if entry.is_symlink():
+                            submit(self._copy_symlink, entry.path, dst, report)
+                        elif entry.is_dir():
+                            stack.append((entry.path, dst))
+                        else:
+                            submit(self._copy_file, entry.path, dst, report)
+            except OSError as e:
+                self._add_error(report, src_dir, dst_dir, e)
+
+    def _copy_file(self, source: str, destination: str, report: CopyReport) -> None:
+        try:
+            copied: bool = not self._sync or self._sync.needs_copy(source, destination)
+            if copied:
+                self._copy_function(source, destination)
+                if self._sync:
+                    self._sync.record(source, destination)
+            if self._on_done:
+                self._on_done(source, destination)
+        except OSError as e:
+            self._add_error(report, source, destination, e)
+            return
+        self._count(report, copied)
+
+    def _copy_symlink(self, source: str, destination: str, report: CopyReport) -> None:
+        try:
+            link_target: str = os.readlink(source)
+            copied: bool = True
+            if self._sync and os.path.lexists(destination):
+                if os.path.islink(destination) and os.readlink(destination) == link_target:
+                    copied = False
+                else:
+                    os.unlink(destination)
+            if copied:
+                os.symlink(link_target, destination)
+                shutil.copystat(source, destination, follow_symlinks=False)
+            if self._on_done:
+                self._on_done(source, destination)
+        except OSError as e:
+            self._add_error(report, source, destination, e)
+            return
+        self._count(report, copied)
+
+    def _count(self, report: CopyReport, copied: bool) -> None:
+        with self._lock:
+            if copied:
+                report.copied += 1
+            else:
+                report.skipped += 1
+            if self._progress:
+                self._progress(report)
+
+    def _add_error(self, report: CopyReport, source: str, destination: str, error: OSError) -> None:
+        with self._lock:
+            report.errors.append(CopyError(source, destination, error.strerror or str(error)))
@@ -0,0 +1,197 @@
+"""
+Low-level file I/O helpers: kernel-side data transfer without copying through user space.
+"""
+import errno
+import os
+import shutil
+from types import ModuleType
+
+from src.constants import CHUNK_SIZE
+from src.enums.reflink_mode import ReflinkMode
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None  # type: ignore[assignment]
+
+
+FICLONE: int = 0x40049409              # _IOW(0x94, 9, int) - share all extents of a file (btrfs, XFS, bcachefs)
+COPY_FILE_RANGE_BLOCK: int = 2 ** 30   # bytes per copy_file_range call
+
+# copy_file_range can't be used for this pair of files - switch to read/write
+_COPY_RANGE_FALLBACK_ERRORS = (errno.EXDEV, errno.ENOSYS, errno.EINVAL, errno.EOPNOTSUPP, errno.EBADF, errno.EPERM)
+
+
+def kernel_transfer_enabled() -> bool:
+    """
+    Whether sendfile-like syscalls and ioctls may be used on descriptors from os.open.
+    A fake file system (pyfakefs in tests) replaces the os module with an object, and its descriptors
+    mean nothing to the kernel.
+    """
+    return isinstance(os, ModuleType) and hasattr(os, "sendfile")
+
+
+def sendfile_all(in_fd: int, out_fd: int) -> bool:
+    """
+    Send the whole file in_fd to out_fd with os.sendfile (zero-copy on Linux)
+    :param in_fd: descriptor of a regular file, read from offset 0
+    :param out_fd: destination descriptor (file, pipe or socket)
+    :return: False if sendfile isn't supported for these descriptors and nothing was sent
+    """
+    if not kernel_transfer_enabled():
+        return False
+
+    block_size: int = max(os.fstat(in_fd).st_size, 2 ** 23)  # 8 MiB minimum, like shutil
+    offset: int = 0
+    while True:
+        try:
+            sent = os.sendfile(out_fd, in_fd, offset, block_size)
+        except OSError as e:
+            if offset == 0 and e.errno in (errno.EINVAL, errno.ENOSYS, errno.ENOTSUP, errno.ENOTSOCK):
+                return False
+            raise
+        if sent == 0:
+            return True
+        offset += sent
+
+
+def copy_file(
+        source: str | os.PathLike,
+        destination: str | os.PathLike,
+        reflink: ReflinkMode = ReflinkMode.auto,
+) -> str:
+    """
+    shutil.copy2 replacement: copy content with the cheapest available method, then metadata.
+    Reflink (shared extents on CoW file systems) -> copy_file_range inside the kernel -> read/write.
+    Holes of sparse files are kept.
+    :param source: file to copy
+    :param destination: file or directory to copy into
+    :param reflink: auto - try reflink first, always - fail if reflink isn't possible, never - don't try it
+    :return: destination file path
+    """
+    source, destination = os.fspath(source), os.fspath(destination)
+    if os.path.isdir(destination):
+        destination = os.path.join(destination, os.path.basename(source))
+    if os.path.exists(destination) and os.path.samefile(source, destination):
+        raise shutil.SameFileError(f"{source} and {destination} are the same file")
+
+    binary: int = getattr(os, "O_BINARY", 0)
+    src_fd: int = os.open(source, os.O_RDONLY | binary)
+    try:
+        dst_fd: int = os.open(destination, os.O_WRONLY | os.O_CREAT | os.O_TRUNC | binary, 0o666)
+        try:
+            copy_content(src_fd, dst_fd, reflink)
+        except BaseException:
+            os.close(dst_fd)
+            os.unlink(destination)  # don't leave a truncated copy behind
+            raise
+        os.close(dst_fd)
+    finally:
+        os.close(src_fd)
+    shutil.copystat(source, destination)
+    return destination
+
+
+def copy_content(src_fd: int, dst_fd: int, reflink: ReflinkMode = ReflinkMode.auto) -> str:
+    """
+    Copy file content between descriptors, destination must be empty
+    :return: method used - "reflink", "copy_file_range" or "read_write"
+    """
+    if not kernel_transfer_enabled():
+        if reflink == ReflinkMode.always:
+            raise OSError(errno.EOPNOTSUPP, "Reflink is not supported here")
+        _copy_segments(src_fd, dst_fd, use_copy_range=False)
+        return "read_write"
+
+    if reflink != ReflinkMode.never:
+        try:
+            if fcntl is None:
+                raise OSError(errno.EOPNOTSUPP, "Reflink is not supported on this platform")
+            fcntl.ioctl(dst_fd, FICLONE, src_fd)
+            return "reflink"
+        except OSError as e:
+            if reflink == ReflinkMode.always:
+                raise OSError(e.errno, f"Reflink is not possible: {e.strerror}") from e
+
+    used_copy_range: bool = _copy_segments(src_fd, dst_fd, use_copy_range=hasattr(os, "copy_file_range"))
+    return "copy_file_range" if used_copy_range else "read_write"
+
+
+def data_segments(fd: int, size: int) -> list[tuple[int, int]]:
+    """
+    Ranges (offset, length) of a file which contain data, holes of sparse files are skipped.
+    Whole file is one segment when SEEK_DATA/SEEK_HOLE aren't supported.
+    """
+    if not hasattr(os, "SEEK_DATA") or not kernel_transfer_enabled():
+        return [(0, size)] if size else []
+
+    segments: list[tuple[int, int]] = []
+    offset: int = 0
+    try:
+        while offset < size:
+            try:
+                start: int = os.lseek(fd, offset, os.SEEK_DATA)
+            except OSError as e:
+                if e.errno == errno.ENXIO:  # only a hole left till the end of file
+                    break
+                raise
+            end: int = min(os.lseek(fd, start, os.SEEK_HOLE), size)
+            segments.append((start, end - start))
+            offset = end
+    except OSError:
+        return [(0, size)] if size else []
+    finally:
+        os.lseek(fd, 0, os.SEEK_SET)
+    return segments
+
+
+def _copy_segments(src_fd: int, dst_fd: int, use_copy_range: bool) -> bool:
+    """
+    Copy data segments to the same offsets, holes stay unallocated
+    :return: True if copy_file_range was used for all data
+    """
+    size: int = os.fstat(src_fd).st_size
+    for offset, length in data_segments(src_fd, size):
+        if use_copy_range:
+            use_copy_range = _copy_range(src_fd, dst_fd, offset, length)
+        if not use_copy_range:
+            _read_write_range(src_fd, dst_fd, offset, length)
+    # Trailing hole - set size without writing zeros
+    if os.fstat(dst_fd).st_size != size:
+        os.ftruncate(dst_fd, size)
+    return use_copy_range
+
+
+def _copy_range(src_fd: int, dst_fd: int, offset: int, length: int) -> bool:
+    """
+    :return: False if copy_file_range isn't usable and nothing was copied
+    """
+    done: int = 0
+    while done < length:
+        try:
+            copied: int = os.copy_file_range(
+                src_fd, dst_fd, min(length - done, COPY_FILE_RANGE_BLOCK),
+                offset + done, offset + done,
+            )
+        except OSError as e:
+            if done == 0 and e.errno in _COPY_RANGE_FALLBACK_ERRORS:
+                return False
+            raise
+        if copied == 0:  # source got shorter while copying
+            break
+        done += copied
+    return True
+
+
+def _read_write_range(src_fd: int, dst_fd: int, offset: int, length: int) -> None:
+    os.lseek(src_fd, offset, os.SEEK_SET)
+    os.lseek(dst_fd, offset, os.SEEK_SET)
+    done: int = 0
+    while done < length:
+        chunk: bytes = os.read(src_fd, min(length - done, CHUNK_SIZE))
+        if not chunk:
+            break
+        view = memoryview(chunk)
+        while view:
+            view = view[os.write(dst_fd, view):]
+        done += len(chunk)
@@ -0,0 +1,90 @@
+"""
+mv: rename on the same file system, resumable copy + verify + delete across file systems.
+"""
+import errno
+import os
+from pathlib import Path
+from typing import Callable
+
+from src.constants import DEFAULT_JOBS
+from src.enums.move_strategy import MoveStrategy
+from src.services.copy_engine import CopyEngine, CopyReport
+from src.services.sync_policy import SyncPolicy
+
+
+class MoveEngine:
+    def __init__(
+            self,
+            jobs: int = DEFAULT_JOBS,
+            copy_function: Callable[[str, str], object] | None = None,
+            progress: Callable[[CopyReport], None] | None = None,
+    ):
+        """
+        :param jobs: number of parallel copy workers for cross-device moves
+        :param copy_function: copies one file with its metadata
+        :param progress: called after every moved file of a cross-device move
+        """
+        self._jobs: int = jobs
+        self._copy_function = copy_function
+        self._progress = progress
+
+    def strategy(self, source: Path, destination_dir: Path) -> MoveStrategy:
+        """
+        Same device - rename is possible, otherwise data has to be copied
+        """
+        if source.lstat().st_dev == destination_dir.stat().st_dev:
+            return MoveStrategy.rename
+        return MoveStrategy.copy_delete
+
+    def move(self, source: Path, destination_dir: Path) -> tuple[MoveStrategy, CopyReport]:
+        """
+        Move source into destination directory
+        :return: strategy taken and copy report (empty for rename)
+        """
+        destination: Path = destination_dir / source.name
+        if self.strategy(source, destination_dir) == MoveStrategy.rename:
+            if destination.exists() or destination.is_symlink():
+                raise FileExistsError(f"Destination path '{destination}' already exists")
+            try:
+                os.rename(source, destination)
+                return MoveStrategy.rename, CopyReport()
+            except OSError as e:
+                if e.errno != errno.EXDEV:  # same st_dev, different mounts (bind mounts) - copy after all
+                    raise
+        return MoveStrategy.copy_delete, self._move_across(source, destination)
+
+    def _move_across(self, source: Path, destination: Path) -> CopyReport:
+        # Files already present from an interrupted move (same size and mtime) are not copied again
+        engine = CopyEngine(
+            self._jobs, self._copy_function, SyncPolicy(destination),
+            on_done=self._verify_and_unlink, progress=self._progress,
+        )
+        if source.is_dir() and not source.is_symlink():
+            report: CopyReport = engine.copy_tree(source, destination)
+            if not report.errors:
+                self._remove_empty_dirs(source)
+            return report
+        return engine.copy_one(source, destination)
+
+    @staticmethod
+    def _verify_and_unlink(source: str, destination: str) -> None:
+        """
+        Delete source only when destination is complete: same type, size and mtime
+        """
+        source_stat = os.lstat(source)
+        destination_stat = os.lstat(destination)
+        if os.path.islink(source):
+            same: bool = os.path.islink(destination) and os.readlink(source) == os.readlink(destination)
+        else:
+            same = (
+                destination_stat.st_size == source_stat.st_size
+                and int(destination_stat.st_mtime) == int(source_stat.st_mtime)
+            )
+        if not same:
+            raise OSError(errno.EIO, "Copy verification failed, source is kept")
+        os.unlink(source)
+
+    @staticmethod
+    def _remove_empty_dirs(root: Path) -> None:
+        for dir_path, _, _ in os.walk(root, topdown=False):
+            os.rmdir(dir_path)
@@ -0,0 +1,213 @@
+"""
+Fast removal of directory trees: sibling subtrees are deleted concurrently, each one with
+directory-descriptor-relative unlinkat/rmdir, and an O(1) trash which is purged in the background.
+"""
+import os
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from types import ModuleType
+
+from src.constants import DEFAULT_JOBS, TRASH_DIR_NAME
+
+_DIR_FLAGS: int = os.O_RDONLY | getattr(os, "O_DIRECTORY", 0) | getattr(os, "O_NOFOLLOW", 0)
+
+
+def _use_fd_functions() -> bool:
+    # Same conditions shutil.rmtree checks; a fake os module (pyfakefs) has no real descriptors
+    return (
+        isinstance(os, ModuleType)
+        and {os.open, os.rmdir, os.unlink} <= os.supports_dir_fd
+        and os.scandir in os.supports_fd
+    )
+
+
+class RemoveEngine:
+    def __init__(self, jobs: int = DEFAULT_JOBS):
+        """
+        :param jobs: number of subtrees removed at the same time
+        """
+        self._jobs: int = max(1, jobs)
+        self._errors: list[str] = []
+        self._lock = threading.Lock()
+
+    def remove_tree(self, path: str | os.PathLike) -> None:
+        """
+        Remove directory with all its content, symlinks are removed, never followed
+        :param path: directory to remove
+        :raise OSError: with all failed paths, after everything removable is removed
+        """
+        path = os.fspath(path)
+        self._errors = []
+        if _use_fd_functions():
+            root_fd: int = os.open(path, _DIR_FLAGS)
+            try:
+                subdirs: list[str] = self._remove_files(root_fd, path)
+                self._run(lambda name: self._remove_subtree_fd(root_fd, name, os.path.join(path, name)), subdirs)
+            finally:
+                os.close(root_fd)
+        else:
+            with os.scandir(path) as entries:
+                subdirs = []
+                for entry in list(entries):
+                    if entry.is_dir(follow_symlinks=False):
+                        subdirs.append(entry.name)
+                    else:
+                        self._try(os.unlink, entry.path)
+            self._run(lambda name: self._try(shutil.rmtree, os.path.join(path, name)), subdirs)
+
+        if not self._errors:
+            self._try(os.rmdir, path)
+        if self._errors:
+            raise OSError(f"Failed to remove {len(self._errors)} entries:\n" + "\n".join(self._errors))
+
+    def _run(self, task, subdirs: list[str]) -> None:
+        if self._jobs == 1 or len(subdirs) < 2:
+            for name in subdirs:
+                task(name)
+            return
+        with ThreadPoolExecutor(max_workers=min(self._jobs, len(subdirs))) as pool:
+            list(pool.map(task, subdirs))
+
+    def _remove_files(self, dir_fd: int, dir_path: str) -> list[str]:
+        """
+        Unlink everything except subdirectories in an open directory
+        :return: names of subdirectories
+        """
+        with os.scandir(dir_fd) as entries:
+            entries = list(entries)  # don't modify directory while reading it
+        subdirs: list[str] = []
+        for entry in entries:
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.name)
+                else:
+                    os.unlink(entry.name, dir_fd=dir_fd)
+            except OSError as e:
+                self._add_error(os.path.join(dir_path, entry.name), e)
+        return subdirs
+
+    def _remove_subtree_fd(self, parent_fd: int, name: str, path: str) -> None:
+        # Iterative post-order walk: deep trees don't hit the recursion limit
+        stack: list[tuple[int, str, str, int, list[str]]] = []
+        self._enter(stack, parent_fd, name, path)
+        try:
+            while stack:
+                parent_fd, name, path, fd, subdirs = stack[-1]
+                if subdirs:
+                    child: str = subdirs.pop()
+                    self._enter(stack, fd, child, os.path.join(path, child))
+                    continue
+                stack.pop()
+                os.close(fd)
+                try:
+                    os.rmdir(name, dir_fd=parent_fd)
+                except OSError as e:
+                    self._add_error(path, e)
+        finally:
+            for _, _, _, fd, _ in stack:
+                os.close(fd)
+
+    def _enter(self, stack: list[tuple[int, str, str, int, list[str]]], parent_fd: int, name: str, path: str) -> None:
+        """
+        Open subdirectory, unlink its files and push it on the walk stack
+        """
+        try:
+            fd: int = os.open(name, _DIR_FLAGS, dir_fd=parent_fd)
+        except OSError as e:
+            self._add_error(path, e)
+            return
+        try:
+            subdirs: list[str] = self._remove_files(fd, path)
+        except OSError as e:
+            os.close(fd)
+            self._add_error(path, e)
+            return
+        stack.append((parent_fd, name, path, fd, subdirs))
+
+    def _try(self, function, path: str) -> None:
+        try:
+            function(path)
+        except OSError as e:
+            self._add_error(path, e)
+
+    def _add_error(self, path: str, error: OSError) -> None:
+        with self._lock:
+            self._errors.append(f"{path}: {error.strerror or error}")
+
+
+class Trash:
+    """
+    rm --trash: the target is renamed into a trash directory on the same file system (O(1)),
+    actual deletion happens later in a separate background process.
+    """
+    def trash_dir_for(self, path: Path) -> Path:
+        """
+        Trash directory on the same device as path: in home directory if possible,
+        otherwise at the mount point, otherwise next to path
+        """
+        device: int = path.parent.stat().st_dev
+        candidates: list[Path] = [Path.home() / TRASH_DIR_NAME, self._mount_point(path.parent) / TRASH_DIR_NAME]
+        for candidate in candidates:
+            try:
+                candidate.mkdir(exist_ok=True)
+                if candidate.stat().st_dev == device:
+                    return candidate
+            except OSError:
+                continue
+        fallback: Path = path.parent / TRASH_DIR_NAME
+        fallback.mkdir(exist_ok=True)
+        return fallback
+
+    def move(self, path: Path) -> Path:
+        """
+        Rename path into trash
+        :return: new location of removed path
+        """
+        target: Path = self.trash_dir_for(path) / f"{time.time_ns()}-{path.name}"
+        os.rename(path, target)
+        return target
+
+    def purge_in_background(self, trash_dir: Path) -> None:
+        """
+        Delete trash content in a detached process, so neither the shell nor a one-shot command waits for it
+        """
+        subprocess.Popen(
+            [sys.executable, "-m", "src.services.remove_engine", str(trash_dir)],
+            cwd=Path(__file__).resolve().parents[2],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+
+    @staticmethod
+    def _mount_point(path: Path) -> Path:
+        device: int = path.stat().st_dev
+        while path.parent != path and path.parent.stat().st_dev == device:
+            path = path.parent
+        return path
+
+
+def purge(trash_dir: str) -> None:
+    """
+    Remove everything inside trash directory
+    """
+    engine = RemoveEngine()
+    with os.scandir(trash_dir) as entries:
+        for entry in list(entries):
+            try:
+                if entry.is_dir(follow_symlinks=False):
+                    engine.remove_tree(entry.path)
+                else:
+                    os.unlink(entry.path)
+            except OSError:
+                continue  # still in use or already purged by another process - next purge will retry
+
+
+if __name__ == "__main__":
+    purge(sys.argv[1])
@@ -0,0 +1,94 @@
+"""
+Bounded LRU cache of path lookups for ConsoleService.handle_path: relative name -> normalized path
+(depends on the current directory) and existing normalized path -> is_dir (expires after a TTL,
+so changes made by other processes are noticed). Missing paths are not cached: cp/mv create them.
+"""
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from src.constants import STAT_CACHE_SIZE, STAT_CACHE_TTL
+
+
+@dataclass(slots=True)
+class StatEntry:
+    is_dir: bool | None     # None - not asked yet
+    expires: float
+
+
+class StatCache:
+    def __init__(self, maxsize: int = STAT_CACHE_SIZE, ttl: float = STAT_CACHE_TTL):
+        """
+        :param maxsize: number of paths kept, least recently used are evicted
+        :param ttl: seconds a cached answer is trusted, 0 - cache disabled
+        """
+        self._maxsize: int = maxsize
+        self._ttl: float = ttl
+        self._entries: OrderedDict[str, StatEntry] = OrderedDict()
+        self._resolved: OrderedDict[str, str] = OrderedDict()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def resolve(self, current_path: str | os.PathLike, pathname: str) -> str:
+        """
+        Join pathname with current directory and normalize it
+        """
+        if os.path.isabs(pathname):
+            return os.path.normpath(pathname)
+        resolved: str | None = self._resolved.get(pathname)
+        if resolved is None:
+            resolved = os.path.normpath(os.path.join(current_path, pathname))
+            self._put(self._resolved, pathname, resolved)
+        else:
+            self._resolved.move_to_end(pathname)
+        return resolved
+
+    def get(self, key: str) -> StatEntry | None:
+        """
+        :return: fresh entry or None (counted as a miss)
+        """
+        entry: StatEntry | None = self._entries.get(key)
+        if entry is None or entry.expires < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def put(self, key: str, is_dir: bool | None = None) -> StatEntry:
+        """
+        Remember that key exists
+        """
+        entry = StatEntry(is_dir, time.monotonic() + self._ttl)
+        if self._ttl > 0:
+            self._put(self._entries, key, entry)
+        return entry
+
+    def invalidate_tree(self, path: str | os.PathLike) -> None:
+        """
+        Forget path and everything below it - called after cp/mv/rm changed it
+        """
+        root: str = os.path.normpath(path)
+        prefix: str = root.rstrip(os.sep) + os.sep
+        for key in [key for key in self._entries if key == root or key.startswith(prefix)]:
+            del self._entries[key]
+
+    def invalidate_relative(self) -> None:
+        """
+        Forget resolved relative names - called when the current directory changes.
+        Stat entries are keyed by absolute paths and stay valid.
+        """
+        self._resolved.clear()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._resolved.clear()
+
+    def _put(self, store: OrderedDict, key: str, value) -> None:
+        store[key] = value
+        store.move_to_end(key)
+        if len(store) > self._maxsize:
+            store.popitem(last=False)
@@ -0,0 +1,88 @@
+"""
+Incremental copy (cp --update): decide per file whether the destination is already up to date.
+"""
+import hashlib
+import json
+import os
+import threading
+
+from src.constants import CP_MANIFEST_NAME
+
+
+class SyncPolicy:
+    def __init__(self, root: str | os.PathLike, checksum: bool = False, use_manifest: bool = False):
+        """
+        :param root: destination root, manifest paths are relative to it
+        :param checksum: compare file contents (blake2b) instead of size + mtime
+        :param use_manifest: remember source size/mtime of copied files in a manifest at destination root,
+                             files unchanged since the previous run are skipped without touching the destination
+        """
+        self._root: str = os.fspath(root)
+        self._checksum: bool = checksum
+        self._manifest_path: str | None = os.path.join(self._root, CP_MANIFEST_NAME) if use_manifest else None
+        self._manifest: dict[str, list[int]] = self._load_manifest()
+        self._lock = threading.Lock()
+
+    def needs_copy(self, source: str, destination: str) -> bool:
+        """
+        :param source: source file
+        :param destination: destination file
+        :return: True if destination is missing or differs from source
+        """
+        source_stat = os.stat(source)
+        signature: list[int] = [source_stat.st_size, source_stat.st_mtime_ns]
+        if self._manifest_path and self._manifest.get(self._key(destination)) == signature:
+            return False
+
+        try:
+            destination_stat = os.stat(destination)
+        except FileNotFoundError:
+            return True
+        if destination_stat.st_size != source_stat.st_size:
+            return True
+        if self._checksum:
+            same: bool = _digest(source) == _digest(destination)
+        else:
+            # Whole seconds, like rsync: not every file system keeps nanoseconds
+            same = int(destination_stat.st_mtime) == int(source_stat.st_mtime)
+        if same:
+            self.record(source, destination)
+        return not same
+
+    def record(self, source: str, destination: str) -> None:
+        """
+        Remember that destination now holds source's current content
+        """
+        if not self._manifest_path:
+            return
+        source_stat = os.stat(source)
+        with self._lock:
+            self._manifest[self._key(destination)] = [source_stat.st_size, source_stat.st_mtime_ns]
+
+    def save(self) -> None:
+        """
+        Write manifest atomically - an interrupted run keeps the previous one
+        """
+        if not self._manifest_path:
+            return
+        tmp_path: str = self._manifest_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            json.dump({"version": 1, "entries": self._manifest}, file)
+        os.replace(tmp_path, self._manifest_path)
+
+    def _key(self, destination: str) -> str:
+        return os.path.relpath(destination, self._root)
+
+    def _load_manifest(self) -> dict[str, list[int]]:
+        if not self._manifest_path:
+            return {}
+        try:
+            with open(self._manifest_path, encoding="utf-8") as file:
+                return json.load(file).get("entries", {})
+        except (OSError, ValueError, AttributeError):
+            return {}  # missing or damaged manifest - compare with destination files
+
+
+def _digest(path: str) -> bytes:
+    with open(path, "rb") as file:
+        return hashlib.file_digest(file, "blake2b").digest()
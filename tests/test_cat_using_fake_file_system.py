@@ -49,4 +49,32 @@ def test_cat_file_with_bytes(service: ConsoleService, fs: FakeFilesystem):
     fs.create_file(path, contents=content)
 
     result = service.cat(path, mode=FileReadMode.bytes)
-    assert result == content
\ No newline at end of file
+    assert result == content
+
+def test_cat_stream_text_split_multibyte(service: ConsoleService, fs: FakeFilesystem):
+    content = "привет, мир"
+    path = os.path.join(service._current_path, "existing.txt")
+    fs.create_file(path, contents=content, encoding="utf-8")
+
+    # 3-byte chunks cut two-byte cyrillic letters in half
+    chunks = list(service.cat_stream(path, mode=FileReadMode.string, chunk_size=3))
+
+    assert len(chunks) > 1
+    assert "".join(chunks) == content
+
+
+def test_cat_stream_bytes(service: ConsoleService, fs: FakeFilesystem):
+    content = b"0123456789"
+    path = os.path.join(service._current_path, "existing.bin")
+    fs.create_file(path, contents=content)
+
+    chunks = list(service.cat_stream(path, mode=FileReadMode.bytes, chunk_size=4))
+
+    assert chunks == [b"0123", b"4567", b"89"]
+
+
+def test_cat_to_fd_is_disabled_on_fake_file_system(service: ConsoleService, fs: FakeFilesystem):
+    path = os.path.join(service._current_path, "existing.bin")
+    fs.create_file(path, contents=b"test")
+
+    assert service.cat_to_fd(path, 1) is False
@@ -4,7 +4,9 @@ from pathlib import Path
 import pytest
 from pyfakefs.fake_filesystem import FakeFilesystem
 
+from src.constants import CP_MANIFEST_NAME
 from src.enums.file_mode import FileReadMode
+from src.services import file_io
 from src.services.console_service import ConsoleService
 
 def test_cp(service: ConsoleService, fs: FakeFilesystem):
@@ -42,3 +44,77 @@ def test_cp_file_needs_no_r(service: ConsoleService, fs: FakeFilesystem):
 
 
 
+def test_cp_recursive_parallel(service: ConsoleService, fs: FakeFilesystem):
+    src: str = os.path.join(service._current_path, "src")
+    dst: str = os.path.join(service._current_path, "dst")
+    fs.create_dir(dst)
+    for i in range(20):
+        fs.create_file(os.path.join(src, f"dir{i % 3}", "nested", f"file{i}.txt"), contents=str(i))
+
+    report = service.cp("src", "dst", True, jobs=4)
+
+    assert report.copied == 20
+    assert report.errors == []
+    for i in range(20):
+        with open(os.path.join(dst, "src", f"dir{i % 3}", "nested", f"file{i}.txt")) as file:
+            assert file.read() == str(i)
+
+
+def test_cp_recursive_reports_errors_at_end(service: ConsoleService, fs: FakeFilesystem, mocker):
+    src: str = os.path.join(service._current_path, "src")
+    dst: str = os.path.join(service._current_path, "dst")
+    fs.create_dir(dst)
+    fs.create_file(os.path.join(src, "bad.txt"))
+    fs.create_file(os.path.join(src, "good.txt"))
+
+    real_copy_file = file_io.copy_file
+    def failing_copy_file(source, destination, **kwargs):
+        if source.endswith("bad.txt"):
+            raise PermissionError(13, "Permission denied")
+        return real_copy_file(source, destination, **kwargs)
+    mocker.patch("src.services.file_io.copy_file", failing_copy_file)
+
+    with pytest.raises(OSError, match="1 failed"):
+        service.cp("src", "dst", True, jobs=1)
+    assert fs.exists(os.path.join(dst, "src", "good.txt"))
+
+
+def test_cp_update_skips_unchanged(service: ConsoleService, fs: FakeFilesystem):
+    src: str = os.path.join(service._current_path, "src")
+    dst: str = os.path.join(service._current_path, "dst")
+    fs.create_dir(dst)
+    fs.create_file(os.path.join(src, "same.txt"), contents="same")
+    fs.create_file(os.path.join(src, "changed.txt"), contents="old")
+
+    assert service.cp("src", "dst", True, jobs=1, update=True).copied == 2
+
+    with open(os.path.join(src, "changed.txt"), "w") as file:
+        file.write("new content")
+    fs.create_file(os.path.join(src, "new.txt"), contents="new")
+
+    report = service.cp("src", "dst", True, jobs=1, update=True)
+    assert (report.copied, report.skipped) == (2, 1)
+    with open(os.path.join(dst, "src", "changed.txt")) as file:
+        assert file.read() == "new content"
+
+
+def test_cp_update_with_manifest(service: ConsoleService, fs: FakeFilesystem):
+    src: str = os.path.join(service._current_path, "src")
+    dst: str = os.path.join(service._current_path, "dst")
+    fs.create_dir(dst)
+    fs.create_file(os.path.join(src, "file.txt"), contents="test")
+
+    service.cp("src", "dst", True, jobs=1, manifest=True)
+    assert fs.exists(os.path.join(dst, "src", CP_MANIFEST_NAME))
+
+    report = service.cp("src", "dst", True, jobs=1, manifest=True)
+    assert (report.copied, report.skipped) == (0, 1)
+
+
+def test_cp_checksum_single_file(service: ConsoleService, fs: FakeFilesystem):
+    dir: str = os.path.join(service._current_path, "data")
+    fs.create_dir(dir)
+    fs.create_file(os.path.join(service._current_path, "file.txt"), contents="test")
+
+    assert service.cp("file.txt", "data", checksum=True).copied == 1
+    assert service.cp("file.txt", "data", checksum=True).skipped == 1
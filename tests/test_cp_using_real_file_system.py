@@ -0,0 +1,50 @@
+import os
+from pathlib import Path
+
+import pytest
+
+from src.enums.reflink_mode import ReflinkMode
+from src.services import file_io
+from src.services.console_service import ConsoleService
+
+
+def test_cp_keeps_holes_of_sparse_file(service: ConsoleService, tmp_path: Path):
+    source: Path = tmp_path / "disk.img"
+    size: int = 64 * 1024 * 1024
+    with open(source, "wb") as file:
+        file.write(b"header")
+        file.seek(size // 2)
+        file.write(b"middle")
+        file.truncate(size)
+    destination_dir: Path = tmp_path / "copy"
+    destination_dir.mkdir()
+
+    service.cp(str(source), str(destination_dir), reflink=ReflinkMode.never)
+
+    copied: Path = destination_dir / "disk.img"
+    assert copied.stat().st_size == size
+    with open(copied, "rb") as file:
+        assert file.read(6) == b"header"
+        file.seek(size // 2)
+        assert file.read(6) == b"middle"
+    if source.stat().st_blocks * 512 < size // 2:   # file system supports holes
+        assert copied.stat().st_blocks * 512 < size // 2
+
+
+def test_copy_content_uses_kernel_copy(tmp_path: Path):
+    if not hasattr(os, "copy_file_range"):
+        pytest.skip("copy_file_range is not available")
+    source: Path = tmp_path / "source.bin"
+    source.write_bytes(os.urandom(3 * 1024 * 1024))
+    destination: Path = tmp_path / "destination.bin"
+
+    src_fd = os.open(source, os.O_RDONLY)
+    dst_fd = os.open(destination, os.O_WRONLY | os.O_CREAT)
+    try:
+        method = file_io.copy_content(src_fd, dst_fd, ReflinkMode.auto)
+    finally:
+        os.close(src_fd)
+        os.close(dst_fd)
+
+    assert method in ("reflink", "copy_file_range")
+    assert destination.read_bytes() == source.read_bytes()
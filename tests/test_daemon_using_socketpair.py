@@ -0,0 +1,59 @@
+import json
+import socket
+import threading
+from pathlib import Path
+
+from src.common import protocol
+from src.dependencies.container import Container
+from src.main import app
+from src.server import handle_connection
+from src.services.console_service import ConsoleService
+
+
+def run_through_daemon(service: ConsoleService, argv: list[str], stdin: list[str] = ()) -> tuple[bytes, int]:
+    daemon_side, client_side = socket.socketpair()
+    container = Container(console_service=service)
+    worker = threading.Thread(target=handle_connection, args=(daemon_side, app, container, service._logger))
+    worker.start()
+
+    protocol.send_frame(client_side, protocol.ARGV, json.dumps(argv).encode())
+    output: bytes = b""
+    answers = iter(stdin)
+    while True:
+        kind, payload = protocol.recv_frame(client_side)
+        if kind == protocol.STDOUT:
+            output += payload
+        elif kind == protocol.PROMPT:
+            protocol.send_frame(client_side, protocol.INPUT, next(answers).encode())
+        elif kind == protocol.EXIT:
+            break
+    worker.join()
+    daemon_side.close()
+    client_side.close()
+    return output, int(payload)
+
+
+def test_daemon_runs_command(service: ConsoleService, tmp_path: Path):
+    (tmp_path / "file.txt").write_text("test")
+
+    output, code = run_through_daemon(service, ["ls", str(tmp_path)])
+
+    assert code == 0
+    assert output == b"file.txt\n"
+
+
+def test_daemon_forwards_prompt(service: ConsoleService, tmp_path: Path):
+    file: Path = tmp_path / "file.txt"
+    file.write_text("test")
+
+    output, code = run_through_daemon(service, ["rm", str(file)], stdin=["y\n"])
+
+    assert code == 0
+    assert b"Are you sure" in output
+    assert not file.exists()
+
+
+def test_daemon_reports_usage_error(service: ConsoleService):
+    _, code = run_through_daemon(service, ["no-such-command"])
+
+    assert code == 2
@@ -0,0 +1,75 @@
+import json
+import logging
+import threading
+
+import pytest
+
+from src.common.logging_setup import JsonLinesFormatter, start_queue, stop_queue
+
+
+class _SlowHandler(logging.Handler):
+    """
+    Collects records; waits for `release` before the first one, like a stalled disk
+    """
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.records: list[logging.LogRecord] = []
+
+    def emit(self, record: logging.LogRecord) -> None:
+        self.release.wait(5)
+        self.records.append(record)
+
+
+@pytest.fixture
+def slow_root():
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    handler = _SlowHandler()
+    root.handlers = [handler]
+    root.setLevel(logging.INFO)
+    yield handler
+    handler.release.set()
+    stop_queue()
+    root.handlers = saved_handlers
+    root.setLevel(saved_level)
+
+
+def test_json_lines_formatter():
+    try:
+        raise ValueError("boom")
+    except ValueError:
+        record = logging.LogRecord("app", logging.ERROR, __file__, 1, "failed %s", ("cp",), exc_info=True)
+        record.exc_info = __import__("sys").exc_info()
+
+    data = json.loads(JsonLinesFormatter().format(record))
+
+    assert data["level"] == "ERROR"
+    assert data["message"] == "failed cp"
+    assert "ValueError: boom" in data["exc"]
+
+
+def test_queue_drops_when_full(slow_root: _SlowHandler):
+    queue_handler = start_queue(maxsize=2)
+
+    for i in range(10):
+        logging.getLogger("app").info("record %d", i)   # returns immediately although the writer is stuck
+    slow_root.release.set()
+    stop_queue()
+
+    assert queue_handler.dropped >= 7
+    messages = [record.getMessage() for record in slow_root.records]
+    assert len(messages) == 10 - queue_handler.dropped + 1
+    assert f"{queue_handler.dropped} records dropped" in messages[-1]
+    assert logging.getLogger().handlers == [slow_root]
+
+
+def test_queue_blocks_when_full(slow_root: _SlowHandler):
+    start_queue(maxsize=2, block=True)
+    threading.Timer(0.1, slow_root.release.set).start()
+
+    for i in range(10):
+        logging.getLogger("app").info("record %d", i)
+    stop_queue()
+
+    assert [record.getMessage() for record in slow_root.records] == [f"record {i}" for i in range(10)]
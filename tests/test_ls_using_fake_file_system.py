@@ -0,0 +1,69 @@
+import os.path
+
+import pytest
+from pyfakefs.fake_filesystem import FakeFilesystem
+from pytest_mock import MockerFixture
+
+from src.constants import STAT_CACHE_TTL
+from src.services.console_service import ConsoleService
+
+
+def test_ls_long(service: ConsoleService, fs: FakeFilesystem):
+    dir: str = os.path.join(service._current_path, "data")
+    fs.create_dir(dir)
+    fs.create_file(os.path.join(dir, "file.txt"), contents="test")
+
+    result = service.ls("data", long=True)
+
+    assert len(result) == 1
+    columns = result[0].rstrip("\n").split("\t")
+    assert columns[0].startswith("-")
+    assert columns[-3] == "4"
+    assert columns[-1] == "file.txt"
+
+
+def test_ls_repeated_uses_stat_cache(service: ConsoleService, fs: FakeFilesystem):
+    fs.create_dir(os.path.join(service._current_path, "data"))
+
+    service.ls("data")
+    service.ls("data")
+
+    assert service.stat_cache.misses == 1
+    assert service.stat_cache.hits == 1
+
+
+def test_ls_after_rm_is_not_served_from_cache(service: ConsoleService, fs: FakeFilesystem):
+    fs.create_dir(os.path.join(service._current_path, "data"))
+    service.ls("data")
+
+    service.rm("data", True, confirm='y')
+
+    with pytest.raises(FileNotFoundError):
+        service.ls("data")
+
+
+def test_ls_relative_path_after_cd(service: ConsoleService, fs: FakeFilesystem):
+    fs.create_dir(os.path.join(service._current_path, "a", "data"))
+    fs.create_file(os.path.join(service._current_path, "a", "data", "inner.txt"))
+    fs.create_dir(os.path.join(service._current_path, "data"))
+    fs.create_file(os.path.join(service._current_path, "data", "outer.txt"))
+    fs.create_file("src/services/curpath.txt")
+    assert service.ls("data") == ["outer.txt\n"]
+
+    service.cd("a")
+
+    assert service.ls("data") == ["inner.txt\n"]
+
+
+def test_ls_notices_outside_changes_after_ttl(service: ConsoleService, fs: FakeFilesystem, mocker: MockerFixture):
+    clock = mocker.patch("src.services.stat_cache.time")
+    clock.monotonic.return_value = 100.0
+    dir: str = os.path.join(service._current_path, "data")
+    fs.create_dir(dir)
+    service.ls("data")
+
+    os.rmdir(dir)   # another process
+    clock.monotonic.return_value = 100.0 + STAT_CACHE_TTL + 1
+
+    with pytest.raises(FileNotFoundError):
+        service.ls("data")
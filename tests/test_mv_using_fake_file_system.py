@@ -5,6 +5,7 @@ import pytest
 from pyfakefs.fake_filesystem import FakeFilesystem
 
 from src.enums.file_mode import FileReadMode
+from src.enums.move_strategy import MoveStrategy
 from src.services.console_service import ConsoleService
 
 def test_mv(service: ConsoleService, fs: FakeFilesystem):
@@ -17,3 +18,42 @@ def test_mv(service: ConsoleService, fs: FakeFilesystem):
     assert fs.exists(os.path.join(service._current_path, "data1", "data2"))
     assert not fs.exists(os.path.join(dir2))
     
+
+def test_mv_same_device_renames(service: ConsoleService, fs: FakeFilesystem):
+    fs.create_file(os.path.join(service._current_path, "file.txt"))
+    fs.create_dir(os.path.join(service._current_path, "data"))
+
+    assert service.mv("file.txt", "data") == MoveStrategy.rename
+
+
+def test_mv_cross_device_copies_and_deletes(service: ConsoleService, fs: FakeFilesystem):
+    mount: str = os.path.join(service._current_path, "mnt")
+    fs.add_mount_point(mount)
+    src: str = os.path.join(service._current_path, "data")
+    for i in range(5):
+        fs.create_file(os.path.join(src, "nested", f"file{i}.txt"), contents=str(i))
+
+    strategy = service.mv("data", "mnt", jobs=2)
+
+    assert strategy == MoveStrategy.copy_delete
+    assert not fs.exists(src)
+    for i in range(5):
+        with open(os.path.join(mount, "data", "nested", f"file{i}.txt")) as file:
+            assert file.read() == str(i)
+
+
+def test_mv_cross_device_resumes(service: ConsoleService, fs: FakeFilesystem):
+    mount: str = os.path.join(service._current_path, "mnt")
+    fs.add_mount_point(mount)
+    fs.create_file(os.path.join(service._current_path, "data", "done.txt"), contents="done")
+    fs.create_file(os.path.join(service._current_path, "data", "left.txt"), contents="left")
+    # Previous interrupted move already copied done.txt
+    service.cp("data/done.txt", "mnt")
+    fs.create_dir(os.path.join(mount, "data"))
+    os.rename(os.path.join(mount, "done.txt"), os.path.join(mount, "data", "done.txt"))
+
+    progress: list[tuple[int, int]] = []
+    service.mv("data", "mnt", jobs=1, progress=lambda report: progress.append((report.copied, report.skipped)))
+
+    assert progress[-1] == (1, 1)
+    assert not fs.exists(os.path.join(service._current_path, "data"))
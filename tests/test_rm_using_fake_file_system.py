@@ -4,8 +4,10 @@ from pathlib import Path
 import pytest
 from pyfakefs.fake_filesystem import FakeFilesystem
 
+from src.constants import TRASH_DIR_NAME
 from src.enums.file_mode import FileReadMode
 from src.services.console_service import ConsoleService
+from src.services.remove_engine import Trash
 
 # def test_cp_for_folder(service: ConsoleService, fs: FakeFilesystem):
 #     dir1: str = os.path.join(service._current_path, "data1")
@@ -42,3 +44,34 @@ def test_rm(service: ConsoleService, fs: FakeFilesystem):
 
 
 
+
+
+def test_rm_tree_parallel(service: ConsoleService, fs: FakeFilesystem):
+    dir: str = os.path.join(service._current_path, "data")
+    for i in range(10):
+        fs.create_file(os.path.join(dir, f"sub{i}", "nested", f"file{i}.txt"))
+    fs.create_file(os.path.join(dir, "top.txt"))
+
+    service.rm("data", True, confirm='y', jobs=4)
+
+    assert not fs.exists(dir)
+
+
+def test_rm_to_trash(service: ConsoleService, fs: FakeFilesystem, mocker):
+    purge = mocker.patch.object(Trash, "purge_in_background")
+    dir: str = os.path.join(service._current_path, "data")
+    fs.create_file(os.path.join(dir, "file.txt"))
+
+    service.rm("data", True, confirm='y', trash=True)
+
+    assert not fs.exists(dir)
+    trash_dir: Path = purge.call_args.args[0]
+    assert trash_dir.name == TRASH_DIR_NAME
+    assert [entry.name.endswith("-data") for entry in trash_dir.iterdir()] == [True]
+
+
+def test_rm_parent_forbidden_with_trash(service: ConsoleService, fs: FakeFilesystem):
+    fs.create_dir(service._current_path)
+
+    with pytest.raises(OSError, match="Removing parent directory is forbidden"):
+        service.rm(str(service._current_path), trash=True, confirm='y')
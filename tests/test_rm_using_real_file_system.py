@@ -0,0 +1,20 @@
+from pathlib import Path
+
+from src.services.console_service import ConsoleService
+
+
+def test_rm_tree_does_not_follow_symlinks(service: ConsoleService, tmp_path: Path):
+    outside: Path = tmp_path / "outside"
+    outside.mkdir()
+    (outside / "keep.txt").write_text("keep")
+    tree: Path = tmp_path / "tree"
+    for i in range(5):
+        nested: Path = tree / f"sub{i}" / "a" / "b"
+        nested.mkdir(parents=True)
+        (nested / "file.txt").write_text(str(i))
+    (tree / "sub0" / "link").symlink_to(outside)
+
+    service.rm(str(tree), True, confirm='y', jobs=3)
+
+    assert not tree.exists()
+    assert (outside / "keep.txt").read_text() == "keep"